@@ -1,16 +1,23 @@
 import streamlit as st
-import streamlit.components.v1 as components
+import io
 import os
-import json
+import re
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
-from tavily import TavilyClient
-import google.generativeai as genai
-from openai import OpenAI
-from utils import save_search
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from utils import save_search, query_cache, disk_cached, clear_disk_cache, get_api_key, FETCH_TTL
+from demo_data import DEMO_REPORT, DEMO_SOURCES, DEMO_X_INTEL
 
 # Load environment variables
 load_dotenv()
 
+# Static assets (CSS, HTML templates) live next to this script
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Page Configuration
 st.set_page_config(
     page_title="CounterPoint",
@@ -24,33 +31,124 @@ if 'last_result' not in st.session_state:
 if 'x_intel_result' not in st.session_state:
     st.session_state.x_intel_result = None
 
-def get_xai_client():
-    """Create xAI (Grok) client with custom base URL."""
-    xai_key = os.getenv("XAI_API_KEY")
-    if not xai_key:
-        return None
+# API clients are cached per key so every rerun and session reuses the same connections.
+# The SDKs are imported on first use: google.generativeai alone pulls in grpc and
+# protobuf, which would otherwise slow down every cold start.
+
+@st.cache_resource(show_spinner=False)
+def _xai_client(api_key):
+    """Build the xAI (Grok) client with custom base URL and a pooled HTTP client."""
+    import httpx
+    from openai import OpenAI, DefaultHttpxClient
+    
     return OpenAI(
-        api_key=xai_key,
-        base_url="https://api.x.ai/v1"
+        api_key=api_key,
+        base_url="https://api.x.ai/v1",
+        max_retries=0,  # retries (429, 5xx, connection errors) are handled by _retry_transient
+        http_client=DefaultHttpxClient(limits=httpx.Limits(max_connections=20))
     )
 
-def get_x_intel(topic):
-    """Fetch X.com intelligence using Grok API."""
-    client = get_xai_client()
-    if not client:
-        return {"error": "XAI_API_KEY not configured"}
+@st.cache_resource(show_spinner=False)
+def _tavily_client(api_key):
+    """Build the Tavily search client."""
+    from tavily import TavilyClient
+    
+    return TavilyClient(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def _gemini_model(api_key):
+    """Configure Gemini once and build the verification model."""
+    import google.generativeai as genai
     
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-flash-latest')
+
+MAX_CONCURRENT_PROVIDER_CALLS = 8
+
+@st.cache_resource(show_spinner=False)
+def _provider_slots():
+    """Process-wide cap on in-flight Grok/Gemini requests across all sessions."""
+    return threading.BoundedSemaphore(MAX_CONCURRENT_PROVIDER_CALLS)
+
+def _is_retryable(exc):
+    """True for rate limits (429), server errors (5xx) and dropped connections or timeouts.
+
+    openai sets status_code and google-api-core sets code; openai's connection and
+    timeout errors carry neither, so they are matched by type.
+    """
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    from openai import APIConnectionError  # also covers APITimeoutError
+    return isinstance(exc, APIConnectionError)
+
+_retry_transient = retry(
+    wait=wait_random_exponential(min=1, max=30),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True
+)
+
+@_retry_transient
+def _create_grok_completion(client, **kwargs):
+    """Send one Grok chat completion inside a provider slot."""
+    with _provider_slots():
+        return client.chat.completions.create(**kwargs)
+
+@_retry_transient
+def _open_gemini_stream(model, prompt):
+    """Start a streamed Gemini generation inside a provider slot.
+
+    429s and 5xx surface here on the first response. The slot is released
+    before each retry's backoff, so a waiting call doesn't hold it; on success
+    it stays held and the caller must release it once the stream is drained.
+    """
+    slots = _provider_slots()
+    slots.acquire()
     try:
-        response = client.chat.completions.create(
-            model="grok-3",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an investigative journalist tool with access to real-time X (Twitter) data. Analyze the latest posts about the user's topic."
-                },
-                {
-                    "role": "user",
-                    "content": f"""Find the latest viral posts and sentiment regarding '{topic}' on X. Return a JSON object with this structure:
+        return model.generate_content(prompt, stream=True)
+    except BaseException:
+        slots.release()
+        raise
+
+def get_xai_client():
+    """Return the shared xAI (Grok) client, or None if no key is configured."""
+    xai_key = get_api_key("xai")
+    if not xai_key:
+        return None
+    return _xai_client(xai_key)
+
+# Opening ```/```json and closing ``` fences around a model's JSON reply
+_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$', re.M)
+
+class _GrokParseError(ValueError):
+    """Grok replied with something that isn't valid JSON; keeps the raw reply for display."""
+    def __init__(self, message, raw):
+        super().__init__(message)
+        self.raw = raw
+
+@st.cache_data(ttl=FETCH_TTL, max_entries=128, show_spinner=False)
+@disk_cached(ttl=FETCH_TTL)
+def _fetch_x_intel(topic):
+    """Query Grok for X.com intelligence.
+
+    Failures raise, so neither cache layer ever stores them; get_x_intel
+    turns them into error dicts.
+    """
+    client = get_xai_client()
+    response = _create_grok_completion(
+        client,
+        model="grok-3",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are an investigative journalist tool with access to real-time X (Twitter) data. Analyze the latest posts about the user's topic."
+            },
+            {
+                "role": "user",
+                "content": f"""Find the latest viral posts and sentiment regarding '{topic}' on X. Return a JSON object with this structure:
 {{
    "x_summary": "2 sentence summary of what people are saying on X",
    "viral_rumors": ["Rumor 1", "Rumor 2"],
@@ -60,79 +158,114 @@ def get_x_intel(topic):
 }}
 
 IMPORTANT: Return ONLY the JSON object, no other text."""
-                }
-            ]
-        )
-        
-        # Parse the JSON response
-        content = response.choices[0].message.content.strip()
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        content = content.strip()
-        
-        return json.loads(content)
-    except json.JSONDecodeError as e:
-        return {"error": f"Failed to parse Grok response: {e}", "raw": content}
+            }
+        ],
+        response_format={"type": "json_object"}
+    )
+    
+    # Parse the JSON response, removing markdown code fences if present
+    content = response.choices[0].message.content
+    content = _FENCE.sub('', content).strip()
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        raise _GrokParseError(str(e), content) from e
+
+XAI_NOT_CONFIGURED = "XAI_API_KEY not configured"
+
+def get_x_intel(topic):
+    """Fetch X.com intelligence using Grok API, reporting failures as an {"error": ...} dict."""
+    if not get_xai_client():
+        return {"error": XAI_NOT_CONFIGURED}
+    
+    try:
+        return _fetch_x_intel(topic)
+    except _GrokParseError as e:
+        return {"error": f"Failed to parse Grok response: {e}", "raw": e.raw}
     except Exception as e:
         return {"error": f"Error calling Grok API: {e}"}
 
+TAVILY_FALLBACK_TIMEOUT = 8  # seconds
+
+def _news_items(response):
+    """Reduce a Tavily response to the url/content/title fields we use."""
+    return [
+        {"url": r.get("url"), "content": r.get("content"), "title": r.get("title")}
+        for r in response.get("results", ())
+    ]
+
+@st.cache_data(ttl=FETCH_TTL, max_entries=128, show_spinner=False)
+@disk_cached(ttl=FETCH_TTL)
 def get_live_news(topic):
-    """Fetches live news using Tavily API. Prioritizes recent sources (< 1 year)."""
-    tavily_key = os.getenv("Tavily API Key") or os.getenv("TAVILY_API_KEY")
+    """Fetches live news using Tavily API. Prioritizes recent sources (< 1 year).
+
+    Errors from the first search propagate so the caller can report them on
+    the script thread; a failed fallback search only means fewer sources.
+    """
+    tavily_key = get_api_key("tavily")
     if not tavily_key:
         return None
     
-    client = TavilyClient(api_key=tavily_key)
+    client = _tavily_client(tavily_key)
     
-    try:
-        # First, try to get recent results (within 1 year)
-        response = client.search(
-            query=topic,
-            search_depth="advanced",
-            include_domains=[],
-            max_results=10,
-            time_range="year"  # Only results from past year
-        )
-        news_data = []
-        for result in response.get("results", []):
-            news_data.append({
-                "url": result.get("url"),
-                "content": result.get("content"),
-                "title": result.get("title")
-            })
-        
-        # If not enough recent results, search without time filter
-        if len(news_data) < 3:
+    # First, try to get recent results (within 1 year). Asking for extra results
+    # up front makes the fallback query below rarely needed.
+    response = client.search(
+        query=topic,
+        search_depth="advanced",
+        include_domains=[],
+        max_results=15,
+        time_range="year"  # Only results from past year
+    )
+    news_data = _news_items(response)
+    
+    # If not enough recent results, search without time filter. The fallback is
+    # bounded so a slow second query can't stall the whole analysis, and if it
+    # times out or fails the recent results found so far are returned as they are.
+    if len(news_data) < 3:
+        try:
             response = client.search(
                 query=topic,
                 search_depth="advanced",
                 include_domains=[],
-                max_results=10
+                max_results=10,
+                timeout=TAVILY_FALLBACK_TIMEOUT
             )
-            news_data = []
-            for result in response.get("results", []):
-                news_data.append({
-                    "url": result.get("url"),
-                    "content": result.get("content"),
-                    "title": result.get("title")
-                })
-        
-        return news_data
-    except Exception as e:
-        st.error(f"Error fetching news: {e}")
-        return []
+        except Exception:
+            return news_data
+        # Keep the recent results and add only sources we don't already have
+        seen = {item["url"] for item in news_data}
+        news_data.extend(item for item in _news_items(response) if item["url"] not in seen)
+    
+    return news_data
 
+PROMPT_CONTENT_CHARS = 500  # per source, in the Gemini prompt
+
+@disk_cached(ttl=FETCH_TTL)
 def verify_news(topic, news_data):
-    """Verifies news using Gemini API."""
-    gemini_key = os.getenv("Gemini API Key") or os.getenv("GEMINI_API_KEY")
+    """Verifies news using Gemini API, yielding the report as it streams in.
+
+    Not wrapped in st.cache_data (generators can't be pickled); repeat topics
+    are served from the query cache, or replayed from the disk cache.
+    Failures, including a stream cut off partway, raise instead of yielding
+    error text, so a partial report is never cached or mistaken for a result.
+    """
+    gemini_key = get_api_key("gemini")
     if not gemini_key:
-        return "Error: Gemini API Key missing."
+        raise ValueError("Gemini API Key missing.")
 
-    genai.configure(api_key=gemini_key)
-    model = genai.GenerativeModel('gemini-flash-latest')
+    model = _gemini_model(gemini_key)
+    
+    # The opening of each article carries the facts; trimming the rest (and
+    # collapsing whitespace) keeps input tokens, and Gemini's prefill time, low
+    compact = [
+        {
+            "title": item.get("title"),
+            "url": item.get("url"),
+            "content": " ".join((item.get("content") or "").split())[:PROMPT_CONTENT_CHARS]
+        }
+        for item in news_data
+    ]
     
     prompt = f"""
     You are a professional news verification analyst. Analyze these search results about '{topic}'.
@@ -157,289 +290,176 @@ def verify_news(topic, news_data):
     [2-3 sentence conclusion]
 
     Context:
-    {news_data}
+    {orjson.dumps(compact).decode()}
     """
 
+    stream = _open_gemini_stream(model, prompt)
     try:
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"Error connecting to Gemini: {e}"
+        for chunk in stream:
+            yield chunk.text
+    finally:
+        # Taken by _open_gemini_stream and held until the stream is drained
+        _provider_slots().release()
+
+def run_analysis(topic):
+    """Fetch Grok in the background while Tavily and then Gemini run in turn.
+
+    Grok doesn't depend on the news pipeline, so wall-clock time drops to about
+    max(Tavily + Gemini, Grok). The calls are blocking HTTP and release the GIL.
+    Tavily and Gemini stay on the Streamlit script thread so they can report
+    errors and stream output directly.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        x_future = executor.submit(get_x_intel, topic)
+        st.write("🔍 Searching global sources...")
+        st.write("🐦 Fetching X.com Intel...")
+        
+        try:
+            news_results = get_live_news(topic)
+        except Exception as e:
+            st.error(f"Error fetching news: {e}")
+            news_results = []
+        
+        confidence = "N/A"
+        verification_report = None
+        if news_results:
+            st.write(f"✅ Found {len(news_results)} articles")
+            st.write("🤖 Running AI fact-check...")
+            try:
+                confidence, report_stream = extract_confidence_prefix(verify_news(topic, news_results))
+                if confidence != "N/A":
+                    st.metric("Confidence", f"{confidence}%")
+                verification_report = st.write_stream(report_stream)
+            except Exception as e:
+                # Whatever streamed before the failure is incomplete: drop it
+                st.error(f"Error connecting to Gemini: {e}")
+                confidence, verification_report = "N/A", None
+        
+        x_intel = x_future.result()
+    return news_results, confidence, verification_report, x_intel
+
+def _analysis_complete(news_results, verification_report, x_intel):
+    """True when the result may go in the query cache.
+
+    Stricter than saving to history: a Grok failure isn't cached, so the next
+    search retries it. X intel that simply isn't configured is not a failure.
+    """
+    return bool(
+        news_results
+        and verification_report
+        and (x_intel or {}).get("error") in (None, XAI_NOT_CONFIGURED)
+    )
+
+# Section headers may arrive wrapped in markdown, e.g. "**KEY FINDINGS:**"
+_HDR = re.compile(r'^[#*\s]*(CONFIDENCE|KEY FINDINGS|UNVERIFIED|SUMMARY)\b(?:[^:]{0,20}:|[#*\s]*$)[*\s]*(.*)$', re.I)
+_BULLET = re.compile(r'^[•\-\*]\s*(.+)$')
+
+def extract_confidence_prefix(chunks):
+    """Pull the leading CONFIDENCE line off a streamed Gemini report.
 
-def parse_gemini_to_html(gemini_response, topic):
-    """Parse Gemini response into styled HTML sections."""
-    lines = gemini_response.split('\n')
+    Consumes chunks only until the first non-blank line is complete and returns
+    (confidence, rest), where rest yields the remaining report text. If that
+    line isn't a confidence header, confidence is "N/A" and nothing is dropped.
+    """
+    chunks = iter(chunks)
+    buffered = ""
+    for chunk in chunks:
+        buffered += chunk
+        if "\n" in buffered.lstrip():
+            break
+    
+    head = buffered.lstrip()
+    first_line, _, remainder = head.partition("\n")
+    header = _HDR.match(first_line.strip())
+    if header and header.group(1).upper() == 'CONFIDENCE':
+        confidence = header.group(2).strip().strip('[]').replace('%', '')
+        buffered = remainder
+    else:
+        confidence = "N/A"
     
-    # Initialize sections
-    confidence = "N/A"
-    key_findings = []
-    unverified = []
-    summary = ""
+    def rest():
+        if buffered:
+            yield buffered
+        yield from chunks
     
+    return confidence, rest()
+
+@st.cache_resource(show_spinner=False)
+def _template_env():
+    """Jinja environment for templates/, built once per process so compiled templates are reused."""
+    return Environment(
+        loader=FileSystemLoader(os.path.join(APP_DIR, "templates")),
+        autoescape=select_autoescape(["html"])
+    )
+
+def load_report_template():
+    """Compiled report template, rendered inline with st.html."""
+    return _template_env().get_template("report.html")
+
+def render_report(findings, unverified, summary="", unverified_title="UNVERIFIED CLAIMS"):
+    """Render report sections into the report template; plain strings are HTML-escaped."""
+    return load_report_template().render(
+        findings=findings,
+        unverified=unverified,
+        summary=summary,
+        unverified_title=unverified_title
+    )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def parse_gemini_to_html(gemini_response, topic, confidence="N/A"):
+    """Parse Gemini response into styled HTML sections.
+
+    The confidence is normally pulled from the stream by extract_confidence_prefix;
+    a CONFIDENCE line still present in the text overrides the passed value.
+    """
+    sections = {'KEY FINDINGS': [], 'UNVERIFIED': [], 'SUMMARY': []}
     current_section = None
     
-    for line in lines:
+    for line in gemini_response.splitlines():
         line = line.strip()
         if not line:
             continue
-            
-        # Detect section headers
-        if line.startswith('CONFIDENCE:'):
-            confidence = line.replace('CONFIDENCE:', '').strip().replace('%', '')
-        elif 'KEY FINDINGS' in line.upper():
-            current_section = 'findings'
-        elif 'UNVERIFIED' in line.upper():
-            current_section = 'unverified'
-        elif 'SUMMARY' in line.upper():
-            current_section = 'summary'
-        elif line.startswith('•') or line.startswith('-') or line.startswith('*'):
-            bullet_text = line.lstrip('•-* ').strip()
-            if current_section == 'findings':
-                key_findings.append(bullet_text)
-            elif current_section == 'unverified':
-                unverified.append(bullet_text)
-        elif current_section == 'summary':
-            summary += line + " "
-    
-    # Build styled HTML with embedded font for iframe
-    html = f'''
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-    * {{ font-family: 'Inter', sans-serif; margin: 0; padding: 0; box-sizing: border-box; }}
-    body {{ background: transparent; }}
-</style>
-<div style="background: #FFFFFF; padding: 30px; border-radius: 16px; box-shadow: 0 4px 12px rgba(0,0,0,0.08); font-family: 'Inter', sans-serif;">
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #F0FDF4; color: #166534; margin-bottom: 15px;">
-        ✓ CONFIRMED FACTS
-    </div>
-    <div style="background: #F0FDF4; border-left: 3px solid #3D8B52; padding: 15px 20px; margin: 10px 0 25px 0; border-radius: 6px;">
-        <ul style="margin: 0; padding-left: 20px; color: #166534; list-style-type: disc;">
-'''
-    for finding in key_findings[:5]:
-        html += f'            <li style="margin-bottom: 8px; line-height: 1.5;">{finding}</li>\n'
-    
-    if not key_findings:
-        html += '            <li style="margin-bottom: 8px;">No confirmed facts extracted from sources.</li>\n'
-    
-    html += '''        </ul>
-    </div>
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #FEF2F2; color: #991B1B; margin-bottom: 15px;">
-        ⚠ UNVERIFIED CLAIMS
-    </div>
-    <div style="background: #FEF2F2; border-left: 3px solid #EF4444; padding: 15px 20px; margin: 10px 0 25px 0; border-radius: 6px;">
-        <ul style="margin: 0; padding-left: 20px; color: #991B1B; list-style-type: disc;">
-'''
-    for claim in unverified[:5]:
-        html += f'            <li style="margin-bottom: 8px; line-height: 1.5;">{claim}</li>\n'
-    
-    if not unverified:
-        html += '            <li style="margin-bottom: 8px;">No unverified claims detected.</li>\n'
-    
-    html += f'''        </ul>
-    </div>
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #F3F4F6; color: #374151; margin-bottom: 15px;">
-        📋 EXECUTIVE SUMMARY
-    </div>
-    <div style="background: #F9FAFB; border-left: 3px solid #6B7280; padding: 15px 20px; margin: 10px 0 0 0; border-radius: 6px; color: #374151; line-height: 1.7;">
-        {summary.strip() if summary.strip() else "Analysis complete. See findings above for details."}
-    </div>
-</div>
-<script>
-    // Send height to Streamlit for auto-sizing
-    const height = document.body.scrollHeight;
-    window.parent.postMessage({{type: 'streamlit:setFrameHeight', height: height}}, '*');
-</script>
-'''
+        
+        header = _HDR.match(line)
+        if header:
+            name, rest = header.group(1).upper(), header.group(2).strip()
+            if name == 'CONFIDENCE':
+                confidence = rest.strip('[]').replace('%', '')
+            else:
+                current_section = name
+                # Keep text that shares the header line, e.g. "SUMMARY: ..."
+                if rest and name == 'SUMMARY':
+                    sections[name].append(rest)
+            continue
+        
+        bullet = _BULLET.match(line)
+        if bullet:
+            if current_section in ('KEY FINDINGS', 'UNVERIFIED'):
+                sections[current_section].append(bullet.group(1))
+        elif current_section == 'SUMMARY':
+            sections['SUMMARY'].append(line)
+    
+    html = render_report(sections['KEY FINDINGS'], sections['UNVERIFIED'], ' '.join(sections['SUMMARY']))
     return html, confidence
 
-def wrap_html_for_autosize(html_content):
-    """Wrap HTML content with auto-resize JavaScript."""
-    return f'''
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-    * {{ font-family: 'Inter', sans-serif; margin: 0; padding: 0; box-sizing: border-box; }}
-    body {{ background: transparent; }}
-</style>
-{html_content}
-<script>
-    // Auto-resize iframe to content height
-    function sendHeight() {{
-        const height = document.body.scrollHeight + 20;
-        window.parent.postMessage({{type: 'streamlit:setFrameHeight', height: height}}, '*');
-    }}
-    window.addEventListener('load', sendHeight);
-    setTimeout(sendHeight, 100);
-    setTimeout(sendHeight, 500);
-</script>
-'''
-
 # ============================================
 # CUSTOM CSS - GREY/TEAL BRANDING
 # ============================================
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-    
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stApp {
-        background: linear-gradient(180deg, #F5F7FA 0%, #E8ECF1 100%);
-    }
-    
-    /* Hero Section */
-    .hero-container {
-        text-align: center;
-        padding: 20px 20px;
-        margin-bottom: 20px;
-    }
-    .hero-title {
-        font-size: 42px;
-        font-weight: 700;
-        color: #374151;
-        margin-bottom: 8px;
-    }
-    .hero-title span {
-        color: #3D8B52;
-    }
-    .hero-subtitle {
-        font-size: 16px;
-        color: #6B7280;
-        margin-bottom: 20px;
-    }
-    
-    /* Report Box */
-    .report-box {
-        background: #FFFFFF;
-        padding: 30px;
-        border-radius: 12px;
-        border-left: 4px solid #3D8B52;
-        color: #374151;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08);
-        line-height: 1.7;
-    }
-    .report-title {
-        color: #3D8B52;
-        font-size: 22px;
-        font-weight: 700;
-        margin-bottom: 20px;
-        padding-bottom: 15px;
-        border-bottom: 2px solid #E5E7EB;
-    }
-    .report-box strong, .report-box b {
-        color: #1F2937;
-        font-weight: 700;
-    }
-    .report-box .section-header {
-        font-weight: 700;
-        margin-top: 20px;
-        margin-bottom: 12px;
-        color: #3D8B52;
-        font-size: 14px;
-        letter-spacing: 0.5px;
-        padding: 8px 12px;
-        background: #F0FDF4;
-        border-radius: 6px;
-        display: inline-block;
-    }
-    .report-box .unverified {
-        background: #FEF2F2;
-        border-left: 3px solid #EF4444;
-        padding: 10px 15px;
-        margin: 10px 0;
-        border-radius: 6px;
-        color: #991B1B;
-    }
-    .report-box .verified {
-        background: #F0FDF4;
-        border-left: 3px solid #3D8B52;
-        padding: 10px 15px;
-        margin: 10px 0;
-        border-radius: 6px;
-        color: #166534;
-    }
-    .report-box ul {
-        padding-left: 20px;
-        color: #4B5563;
-        margin: 10px 0;
-    }
-    .report-box li {
-        margin-bottom: 8px;
-        line-height: 1.6;
-        padding-left: 5px;
-    }
-    
-    /* Confidence Badge */
-    .confidence-large {
-        font-size: 48px;
-        font-weight: 700;
-        color: #3D8B52;
-        text-align: center;
-    }
-    .confidence-label {
-        font-size: 14px;
-        color: #6B7280;
-        text-align: center;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Sources Card */
-    .sources-card {
-        background: #FFFFFF;
-        border: 1px solid #E5E7EB;
-        border-radius: 12px;
-        padding: 20px;
-        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.04);
-    }
-    .sources-title {
-        color: #374151;
-        font-size: 16px;
-        font-weight: 600;
-        margin-bottom: 15px;
-    }
-    
-    /* Hide Streamlit Branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    
-    /* Input Styling */
-    .stTextInput > div > div > input {
-        background-color: #FFFFFF;
-        border: 1px solid #D1D5DB;
-        color: #374151;
-        border-radius: 8px;
-    }
-    .stTextInput > div > div > input:focus {
-        border-color: #3D8B52;
-        box-shadow: 0 0 0 2px rgba(0, 131, 143, 0.2);
-    }
-    
-    /* Button Styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #3D8B52 0%, #4CAF50 100%);
-        color: white;
-        font-weight: 600;
-        border: none;
-        border-radius: 8px;
-        padding: 10px 30px;
-    }
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #4CAF50 0%, #66BB6A 100%);
-    }
-    
-    /* Sidebar Styling */
-    [data-testid="stSidebar"] {
-        background: #FFFFFF;
-        border-right: 1px solid #E5E7EB;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Preconnect so the Inter font fetch starts in parallel with the stylesheet
+FONT_LINKS = """
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap">
+"""
+
+@st.cache_resource(show_spinner=False)
+def load_css():
+    """Read the brand stylesheet from disk once per process."""
+    with open(os.path.join(APP_DIR, "static", "brand.css"), 'r') as f:
+        return f.read()
+
+# Streamlit drops elements that aren't re-emitted, so the (cached) CSS is injected on each run
+st.markdown(f"{FONT_LINKS}<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # ============================================
 # SIDEBAR
@@ -450,6 +470,11 @@ with st.sidebar:
     st.divider()
     demo_mode = st.checkbox("🎯 Enable Demo Mode", value=False)
     st.divider()
+    if st.button("🧹 Clear cache"):
+        st.cache_data.clear()
+        query_cache.clear()
+        clear_disk_cache()
+        st.toast("Cached results cleared.")
     if st.button("⚙️ API Settings"):
         st.switch_page("pages/Settings.py")
 
@@ -477,99 +502,188 @@ with st.container():
 # ============================================
 # HANDLE SEARCH
 # ============================================
-def display_result(result_data):
-    """Display verification results with professional layout."""
-    topic_name = result_data['topic']
+# Static markup for the result views; filled with format_map at render time.
+# Card markup is kept unindented: the cards are joined into one markdown string,
+# where indented lines after a blank line would render as a code block.
+_SECTION_HDR_TPL = """
+<div style="font-size: 20px; font-weight: 700; color: #374151; margin: {margin_top} 0 15px 0; padding-bottom: 10px; border-bottom: 2px solid {color};">
+    {title}
+</div>
+"""
+_REPORT_TITLE_TPL = """
+<div style="margin-bottom: 20px;">
+    <div style="font-size: 28px; font-weight: 700; color: #374151;">Verification Report</div>
+    <div style="font-size: 18px; color: #6B7280; margin-top: 5px;">{topic}</div>
+</div>
+"""
+_CONF_CARD_TPL = """
+<div style="background: #FFFFFF; border-radius: 16px; padding: 20px; text-align: center; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
+    <div style="font-size: 11px; color: #6B7280; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 8px;">Confidence Score</div>
+    <div style="font-size: 52px; font-weight: 700; color: {conf_color}; line-height: 1;">{confidence}%</div>
+    <div style="font-size: 12px; color: {conf_color}; margin-top: 8px; font-weight: 600;">{conf_label}</div>
+</div>
+"""
+_SOURCES_HDR_HTML = """
+<div style="font-size: 14px; font-weight: 700; color: #374151; margin-bottom: 15px; text-transform: uppercase; letter-spacing: 0.5px;">
+    📰 Sources
+</div>
+"""
+_SOURCE_CARD_TPL = """<a href="{url}" target="_blank" style="text-decoration: none; display: block;">
+<div style="background: #FFFFFF; border-radius: 10px; padding: 14px; margin-bottom: 10px; border-left: 4px solid #3D8B52; box-shadow: 0 2px 6px rgba(0,0,0,0.04); transition: transform 0.2s, box-shadow 0.2s;">
+<div style="font-size: 13px; font-weight: 600; color: #374151; margin-bottom: 6px; line-height: 1.4;">{title}</div>
+<div style="display: flex; justify-content: space-between; align-items: center;">
+<span style="font-size: 11px; color: #3D8B52; font-weight: 500;">{domain}</span>
+<span style="font-size: 10px; color: #9CA3AF;">Recent</span>
+</div>
+</div>
+</a>
+"""
+_PLAIN_SOURCE_TPL = '<div style="font-size: 13px; color: #374151; margin-bottom: 10px;">• {source}</div>\n'
+_TWEET_CARD_TPL = """<a href="{link}" target="_blank" style="text-decoration: none; display: block;">
+<div style="background: #FFFFFF; border-radius: 12px; padding: 16px; margin-bottom: 12px; border-left: 4px solid #1DA1F2; box-shadow: 0 2px 8px rgba(0,0,0,0.06);">
+<div style="font-size: 14px; font-weight: 600; color: #1DA1F2; margin-bottom: 8px;">{handle}</div>
+<div style="font-size: 13px; color: #374151; line-height: 1.5;">{text}</div>
+<div style="font-size: 11px; color: #9CA3AF; margin-top: 8px;">View on X →</div>
+</div>
+</a>
+"""
+
+# (minimum score, color, label), highest bucket first
+_CONF_BUCKETS = (
+    (70, "#3D8B52", "High Confidence"),
+    (40, "#F59E0B", "Medium Confidence"),
+    (0, "#EF4444", "Low Confidence"),
+)
+
+def _confidence_style(confidence):
+    """Map a confidence score (int or string like "85"/"85%"/"N/A") to its color and label."""
+    try:
+        if isinstance(confidence, (int, float)):
+            conf_num = int(confidence)
+        else:
+            conf_num = int(str(confidence).rstrip('%') or 0)
+    except ValueError:
+        conf_num = 0  # "N/A" and other non-numeric scores
+    return next(((color, label) for threshold, color, label in _CONF_BUCKETS if conf_num >= threshold),
+                _CONF_BUCKETS[-1][1:])
+
+def _truncate(s, n=40, _e='...', _len=len):
+    """Shorten s to n characters plus an ellipsis; returns s itself when it already fits."""
+    # len and the ellipsis are bound as defaults so card rendering skips global lookups
+    return s if _len(s) <= n else s[:n] + _e
+
+def _source_domain(url):
+    """Extract the display domain from a source URL, without a leading "www."."""
+    try:
+        host = urlsplit(url or '').hostname or 'Source'
+    except ValueError:
+        return 'Source'  # malformed URL, e.g. an unclosed "[" IPv6 host
+    return host[4:] if host.startswith('www.') else host
+
+def _source_card_html(source):
+    """Render one news source as a sidebar card."""
+    if not isinstance(source, dict):
+        return _PLAIN_SOURCE_TPL.format_map({'source': source})
+    
+    url = source.get('url', '#')
+    return _SOURCE_CARD_TPL.format_map({
+        'url': url,
+        'title': _truncate(source.get('title') or 'Article'),
+        'domain': _source_domain(url)
+    })
+
+def _tweet_card_html(source):
+    """Render one featured X post as a card."""
+    return _TWEET_CARD_TPL.format_map({
+        'handle': source.get('handle', '@unknown'),
+        'link': source.get('link', '#'),
+        'text': source.get('text', 'No text available')
+    })
+
+_NL_TO_BR = str.maketrans({'\n': '<br>'})
+
+def build_result_html(result_data):
+    """Pre-render the HTML pieces of the web news section."""
     confidence = result_data['confidence']
     report_content = result_data.get('report_content', '')
     report_html = result_data.get('report_html', '')
-    sources = result_data['sources']
+    conf_color, conf_label = _confidence_style(confidence)
     
-    # Parse confidence for color coding
-    try:
-        conf_num = int(str(confidence).replace('%', '').replace('N/A', '0'))
-    except:
-        conf_num = 0
-    
-    if conf_num >= 70:
-        conf_color = "#3D8B52"
-        conf_label = "High Confidence"
-    elif conf_num >= 40:
-        conf_color = "#F59E0B"
-        conf_label = "Medium Confidence"
-    else:
-        conf_color = "#EF4444"
-        conf_label = "Low Confidence"
+    if not report_html and report_content:
+        # Parse and format the Gemini response
+        report_html = f"""
+        <div style="background: #FFFFFF; padding: 30px; border-radius: 16px; box-shadow: 0 4px 12px rgba(0,0,0,0.08); font-family: 'Inter', sans-serif;">
+            {report_content.translate(_NL_TO_BR)}
+        </div>
+        """
+    
+    # All source cards go out in one markdown call, limited to 6 sources
+    buf = io.StringIO()
+    buf.write(_SOURCES_HDR_HTML)
+    for source in result_data['sources'][:6]:
+        buf.write(_source_card_html(source))
+    
+    return {
+        'title': _REPORT_TITLE_TPL.format_map({'topic': result_data['topic']}),
+        'conf_card': _CONF_CARD_TPL.format_map({
+            'conf_color': conf_color,
+            'confidence': confidence,
+            'conf_label': conf_label
+        }),
+        'report': report_html,
+        'sources': buf.getvalue()
+    }
+
+def build_x_intel_html(x_data):
+    """Pre-render the featured post cards of the X.com section."""
+    if not x_data or "error" in x_data:
+        return {'tweets': ''}
+    # Limited to 5 tweets, all in one markdown call
+    buf = io.StringIO()
+    for source in x_data.get('sources', [])[:5]:
+        buf.write(_tweet_card_html(source))
+    return {'tweets': buf.getvalue()}
+
+def get_render_bundle(result_data, x_intel_data):
+    """Return the pre-rendered HTML for these results.
+
+    The bundle is kept in session state and reused on reruns (e.g. the
+    "Previous Result" view) until either result object is replaced.
+    """
+    key = hash((id(result_data), id(x_intel_data)))
+    if st.session_state.get('_last_render_key') == key and '_last_render_bundle' in st.session_state:
+        return st.session_state['_last_render_bundle']
     
+    bundle = build_x_intel_html(x_intel_data)
+    if result_data:
+        bundle.update(build_result_html(result_data))
+    st.session_state['_last_render_key'] = key
+    st.session_state['_last_render_bundle'] = bundle
+    return bundle
+
+def display_result(bundle):
+    """Display verification results with professional layout."""
     # ===== HEADER ROW: Title + Confidence =====
     header_col1, header_col2 = st.columns([3, 1])
     
     with header_col1:
-        st.markdown(f"""
-        <div style="margin-bottom: 20px;">
-            <div style="font-size: 28px; font-weight: 700; color: #374151;">Verification Report</div>
-            <div style="font-size: 18px; color: #6B7280; margin-top: 5px;">{topic_name}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(bundle['title'], unsafe_allow_html=True)
     
     with header_col2:
-        st.markdown(f"""
-        <div style="background: #FFFFFF; border-radius: 16px; padding: 20px; text-align: center; box-shadow: 0 4px 12px rgba(0,0,0,0.08);">
-            <div style="font-size: 11px; color: #6B7280; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 8px;">Confidence Score</div>
-            <div style="font-size: 52px; font-weight: 700; color: {conf_color}; line-height: 1;">{confidence}%</div>
-            <div style="font-size: 12px; color: {conf_color}; margin-top: 8px; font-weight: 600;">{conf_label}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(bundle['conf_card'], unsafe_allow_html=True)
     
     # ===== MAIN CONTENT: Report + Sources Sidebar =====
     main_col, sources_col = st.columns([2.5, 1])
     
     with main_col:
-        # Use components.html for proper HTML rendering without escaping
-        if report_html:
-            components.html(report_html, height=700, scrolling=True)
-        elif report_content:
-            # Parse and format the Gemini response
-            html_content = f"""
-            <div style="background: #FFFFFF; padding: 30px; border-radius: 16px; box-shadow: 0 4px 12px rgba(0,0,0,0.08); font-family: 'Inter', sans-serif;">
-                {report_content.replace(chr(10), '<br>')}
-            </div>
-            """
-            components.html(html_content, height=700, scrolling=True)
+        # st.html renders inline: no iframe, resize script or second font download
+        if bundle['report']:
+            st.html(bundle['report'])
     
     with sources_col:
-        st.markdown("""
-        <div style="font-size: 14px; font-weight: 700; color: #374151; margin-bottom: 15px; text-transform: uppercase; letter-spacing: 0.5px;">
-            📰 Sources
-        </div>
-        """, unsafe_allow_html=True)
-        
-        for i, source in enumerate(sources[:6]):  # Limit to 6 sources
-            if isinstance(source, dict):
-                title = source.get('title', 'Article')
-                title_display = title[:40] + '...' if len(title) > 40 else title
-                url = source.get('url', '#')
-                # Extract domain
-                try:
-                    domain = url.split('/')[2].replace('www.', '')
-                except:
-                    domain = 'Source'
-                
-                st.markdown(f"""
-                <a href="{url}" target="_blank" style="text-decoration: none; display: block;">
-                    <div style="background: #FFFFFF; border-radius: 10px; padding: 14px; margin-bottom: 10px; border-left: 4px solid #3D8B52; box-shadow: 0 2px 6px rgba(0,0,0,0.04); transition: transform 0.2s, box-shadow 0.2s;">
-                        <div style="font-size: 13px; font-weight: 600; color: #374151; margin-bottom: 6px; line-height: 1.4;">{title_display}</div>
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <span style="font-size: 11px; color: #3D8B52; font-weight: 500;">{domain}</span>
-                            <span style="font-size: 10px; color: #9CA3AF;">Recent</span>
-                        </div>
-                    </div>
-                </a>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"• {source}")
+        st.markdown(bundle['sources'], unsafe_allow_html=True)
 
-def display_x_intel(x_data, topic):
+def display_x_intel(x_data, bundle):
     """Display X.com Intel data from Grok."""
     if not x_data:
         st.info("No X.com data available. Click 'Analyze' to fetch X intelligence.")
@@ -598,57 +712,51 @@ def display_x_intel(x_data, topic):
     sources = x_data.get('sources', [])
     if sources:
         st.markdown("### 🐦 Featured Posts")
-        for source in sources[:5]:  # Limit to 5 tweets
-            handle = source.get('handle', '@unknown')
-            link = source.get('link', '#')
-            text = source.get('text', 'No text available')
-            
-            st.markdown(f"""
-            <a href="{link}" target="_blank" style="text-decoration: none; display: block;">
-                <div style="background: #FFFFFF; border-radius: 12px; padding: 16px; margin-bottom: 12px; border-left: 4px solid #1DA1F2; box-shadow: 0 2px 8px rgba(0,0,0,0.06);">
-                    <div style="font-size: 14px; font-weight: 600; color: #1DA1F2; margin-bottom: 8px;">{handle}</div>
-                    <div style="font-size: 13px; color: #374151; line-height: 1.5;">{text}</div>
-                    <div style="font-size: 11px; color: #9CA3AF; margin-top: 8px;">View on X →</div>
-                </div>
-            </a>
-            """, unsafe_allow_html=True)
+        st.markdown(bundle['tweets'], unsafe_allow_html=True)
     else:
         st.info("No featured posts found.")
 
 def display_results_stacked(result_data, x_intel_data, topic):
     """Display results in stacked layout with Global Web News above X.com Intel."""
+    bundle = get_render_bundle(result_data, x_intel_data)
     
     # ===== SECTION 1: Global Web News =====
-    st.markdown("""
-    <div style="font-size: 20px; font-weight: 700; color: #374151; margin: 20px 0 15px 0; padding-bottom: 10px; border-bottom: 2px solid #3D8B52;">
-        🌐 Global Web News
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SECTION_HDR_TPL.format_map({
+        'margin_top': '20px', 'color': '#3D8B52', 'title': '🌐 Global Web News'
+    }), unsafe_allow_html=True)
     
     if result_data:
-        display_result(result_data)
+        display_result(bundle)
     else:
         st.info("No web news data available.")
     
     # ===== SECTION 2: X.com Intel =====
-    st.markdown("""
-    <div style="font-size: 20px; font-weight: 700; color: #374151; margin: 40px 0 15px 0; padding-bottom: 10px; border-bottom: 2px solid #1DA1F2;">
-        🐦 X.com Intel
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_SECTION_HDR_TPL.format_map({
+        'margin_top': '40px', 'color': '#1DA1F2', 'title': '🐦 X.com Intel'
+    }), unsafe_allow_html=True)
     
-    display_x_intel(x_intel_data, topic)
+    display_x_intel(x_intel_data, bundle)
 
 
-if submit_button:
-    tavily_key = os.getenv("TAVILY_API_KEY")
-    gemini_key = os.getenv("GEMINI_API_KEY")
+# ============================================
+# DEMO DATA ("Dubai Storm" with Demo Mode enabled)
+# ============================================
+@st.cache_resource(show_spinner=False)
+def demo_report_html():
+    """The demo report is fixed, so it is rendered once per process."""
+    return render_report(**DEMO_REPORT)
+
 
+if submit_button:
+    # Normalize once so "Trump " and "Trump" share cache entries
+    topic = topic.strip()
     if not topic:
+        # Blank or whitespace-only input: stop before any API call is made
         st.warning("Please enter a topic to verify.")
+        st.stop()
     
     # DEMO MODE
-    elif demo_mode and topic.strip().lower() == "dubai storm":
+    if demo_mode and topic.lower() == "dubai storm":
         with st.status("Analyzing...", expanded=True) as status:
             st.write("🔍 Searching global sources...")
             st.write("✅ Found 5 articles")
@@ -656,127 +764,49 @@ if submit_button:
             st.write("✅ Complete")
             status.update(label="✅ Verification Complete", state="complete", expanded=False)
         
-        report_html = """
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-    * { font-family: 'Inter', sans-serif; margin: 0; padding: 0; box-sizing: border-box; }
-    body { background: transparent; }
-</style>
-<div style="background: #FFFFFF; padding: 30px; border-radius: 16px; box-shadow: 0 4px 12px rgba(0,0,0,0.08); font-family: 'Inter', sans-serif;">
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #F0FDF4; color: #166534; margin-bottom: 15px;">
-        ✓ CONFIRMED FACTS
-    </div>
-    <div style="background: #F0FDF4; border-left: 3px solid #3D8B52; padding: 15px 20px; margin: 10px 0 25px 0; border-radius: 6px;">
-        <ul style="margin: 0; padding-left: 20px; color: #166534; list-style-type: disc;">
-            <li style="margin-bottom: 8px; line-height: 1.5;">Heavy rainfall and thunderstorms have struck Dubai and other parts of the UAE.</li>
-            <li style="margin-bottom: 8px; line-height: 1.5;">Flights at Dubai International Airport (DXB) have been disrupted with cancellations and diversions.</li>
-            <li style="margin-bottom: 8px; line-height: 1.5;">Schools and government offices have switched to remote work due to weather conditions.</li>
-            <li style="margin-bottom: 0; line-height: 1.5;">Authorities have issued weather warnings advising residents to stay indoors.</li>
-        </ul>
-    </div>
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #FEF2F2; color: #991B1B; margin-bottom: 15px;">
-        ⚠ UNVERIFIED RUMORS
-    </div>
-    <div style="background: #FEF2F2; border-left: 3px solid #EF4444; padding: 15px 20px; margin: 10px 0 25px 0; border-radius: 6px;">
-        <ul style="margin: 0; padding-left: 20px; color: #991B1B; list-style-type: disc;">
-            <li style="margin-bottom: 8px; line-height: 1.5;"><strong>Rumor:</strong> The Burj Khalifa has been struck by lightning and structurally damaged. → <span style="color:#EF4444; font-weight:bold;">FALSE</span></li>
-            <li style="margin-bottom: 0; line-height: 1.5;"><strong>Rumor:</strong> All roads in Dubai are completely closed. → <span style="color:#EF4444; font-weight:bold;">FALSE</span></li>
-        </ul>
-    </div>
-    
-    <div style="display: inline-block; padding: 8px 16px; border-radius: 6px; font-weight: 700; font-size: 14px; background: #F3F4F6; color: #374151; margin-bottom: 15px;">
-        📋 EXECUTIVE SUMMARY
-    </div>
-    <div style="background: #F9FAFB; border-left: 3px solid #6B7280; padding: 15px 20px; margin: 10px 0 0 0; border-radius: 6px; color: #374151; line-height: 1.7;">
-        The event is a significant weather anomaly causing widespread disruption across the UAE. Official government and news sources confirm the severity of the rainfall and its impact on transportation and daily activities. However, claims of major structural damage to landmarks like Burj Khalifa have been debunked by authorities.
-    </div>
-</div>
-<script>
-    function sendHeight() {
-        const height = document.body.scrollHeight + 20;
-        window.parent.postMessage({type: 'streamlit:setFrameHeight', height: height}, '*');
-    }
-    window.addEventListener('load', sendHeight);
-    setTimeout(sendHeight, 100);
-    setTimeout(sendHeight, 500);
-</script>
-"""
-        sources = [
-            {"title": "Gulf News Live Updates", "url": "https://gulfnews.com"},
-            {"title": "Khaleej Times Weather Report", "url": "https://khaleejtimes.com"},
-            {"title": "UAE National Centre of Meteorology", "url": "https://ncm.ae"},
-            {"title": "Emirates 24/7 News", "url": "https://emirates247.com"},
-            {"title": "The National UAE", "url": "https://thenationalnews.com"}
-        ]
-        
-        # Save to history (will save x_intel after it's set)
-        x_intel_demo = {
-            "x_summary": "Dubai Storm is trending with residents sharing dramatic flooding videos. Mixed reactions between concern for safety and amazement at unusual weather.",
-            "viral_rumors": [
-                "Claims that Burj Khalifa was struck by lightning - UNVERIFIED",
-                "Reports of 'cloud seeding' causing the storm - DEBATED"
-            ],
-            "sources": [
-                {"handle": "@DubaiMediaOffice", "link": "https://x.com/DubaiMediaOffice", "text": "Heavy rainfall expected. Residents advised to stay indoors and avoid unnecessary travel."},
-                {"handle": "@weatheruae", "link": "https://x.com/weatheruae", "text": "Historic rainfall levels recorded in Dubai. Stay safe everyone!"},
-                {"handle": "@gaborsteingart", "link": "https://x.com/gaborsteingart", "text": "Incredible scenes from Dubai airport as floods disrupt flights."}
-            ]
-        }
-        save_search("Dubai Storm (Demo)", 100, report_html, x_intel_demo)
+        demo_html = demo_report_html()
+        save_search("Dubai Storm (Demo)", 100, demo_html, DEMO_X_INTEL)
         
         # Store in session state
         st.session_state.last_result = {
             'topic': "Dubai Storm",
             'confidence': 100,
-            'report_html': report_html,
-            'sources': sources
+            'report_html': demo_html,
+            'sources': DEMO_SOURCES
         }
         
-        # Fetch X.com Intel (demo: use mock data)
-        st.session_state.x_intel_result = {
-            "x_summary": "Dubai Storm is trending with residents sharing dramatic flooding videos. Mixed reactions between concern for safety and amazement at unusual weather.",
-            "viral_rumors": [
-                "Claims that Burj Khalifa was struck by lightning - UNVERIFIED",
-                "Reports of 'cloud seeding' causing the storm - DEBATED"
-            ],
-            "sources": [
-                {"handle": "@DubaiMediaOffice", "link": "https://x.com/DubaiMediaOffice", "text": "Heavy rainfall expected. Residents advised to stay indoors and avoid unnecessary travel."},
-                {"handle": "@weatheruae", "link": "https://x.com/weatheruae", "text": "Historic rainfall levels recorded in Dubai. Stay safe everyone!"},
-                {"handle": "@gaborsteingart", "link": "https://x.com/gaborsteingart", "text": "Incredible scenes from Dubai airport as floods disrupt flights."}
-            ]
-        }
+        # X.com Intel (demo: use mock data)
+        st.session_state.x_intel_result = DEMO_X_INTEL
         
         display_results_stacked(st.session_state.last_result, st.session_state.x_intel_result, "Dubai Storm")
     
     # REAL MODE
-    elif not tavily_key or not gemini_key:
+    elif not get_api_key("tavily") or not get_api_key("gemini"):
         st.error("Missing API Keys. Please configure them in **Settings**.")
     else:
-        news_results = None
-        verification_report = None
-        
         with st.status("Analyzing...", expanded=True) as status:
-            st.write("🔍 Searching global sources...")
-            news_results = get_live_news(topic)
+            cached = query_cache.get(topic)
+            if cached:
+                st.write("⚡ Loaded cached analysis")
+                news_results, confidence_score, verification_report, x_intel = cached
+            else:
+                news_results, confidence_score, verification_report, x_intel = run_analysis(topic)
+                if _analysis_complete(news_results, verification_report, x_intel):
+                    query_cache.set(topic, (news_results, confidence_score, verification_report, x_intel))
             
-            if news_results:
-                st.write(f"✅ Found {len(news_results)} articles")
-                st.write("🤖 Running AI fact-check...")
-                verification_report = verify_news(topic, news_results)
-                st.write("🐦 Fetching X.com Intel...")
-                x_intel = get_x_intel(topic)
+            if news_results and verification_report:
                 st.write("✅ Complete")
                 status.update(label="✅ Verification Complete", state="complete", expanded=False)
+            elif news_results:
+                status.update(label="❌ Verification Failed", state="error")
             else:
                 status.update(label="❌ Search Failed", state="error")
         
         if news_results and verification_report:
             # Parse Gemini response into styled HTML
-            report_html, confidence_score = parse_gemini_to_html(verification_report, topic)
+            report_html, confidence_score = parse_gemini_to_html(verification_report, topic, confidence_score)
             
-            # Save to history with X intel data
+            # Save to history with X intel data; a Grok error alone doesn't block this
             save_search(topic, confidence_score, report_html, x_intel)
             
             # Store in session state
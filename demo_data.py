@@ -0,0 +1,40 @@
+# Fixed data for the "Dubai Storm" demo (Demo Mode enabled). Kept out of
+# Dashboard.py so it is built once per process on import, not on every rerun.
+from markupsafe import Markup
+
+# Demo items carry their own markup, so they are marked safe for the template
+DEMO_REPORT = {
+    'findings': [
+        "Heavy rainfall and thunderstorms have struck Dubai and other parts of the UAE.",
+        "Flights at Dubai International Airport (DXB) have been disrupted with cancellations and diversions.",
+        "Schools and government offices have switched to remote work due to weather conditions.",
+        "Authorities have issued weather warnings advising residents to stay indoors."
+    ],
+    'unverified': [
+        Markup('<strong>Rumor:</strong> The Burj Khalifa has been struck by lightning and structurally damaged. → <span style="color:#EF4444; font-weight:bold;">FALSE</span>'),
+        Markup('<strong>Rumor:</strong> All roads in Dubai are completely closed. → <span style="color:#EF4444; font-weight:bold;">FALSE</span>')
+    ],
+    'summary': "The event is a significant weather anomaly causing widespread disruption across the UAE. Official government and news sources confirm the severity of the rainfall and its impact on transportation and daily activities. However, claims of major structural damage to landmarks like Burj Khalifa have been debunked by authorities.",
+    'unverified_title': "UNVERIFIED RUMORS"
+}
+
+DEMO_SOURCES = [
+    {"title": "Gulf News Live Updates", "url": "https://gulfnews.com"},
+    {"title": "Khaleej Times Weather Report", "url": "https://khaleejtimes.com"},
+    {"title": "UAE National Centre of Meteorology", "url": "https://ncm.ae"},
+    {"title": "Emirates 24/7 News", "url": "https://emirates247.com"},
+    {"title": "The National UAE", "url": "https://thenationalnews.com"}
+]
+
+DEMO_X_INTEL = {
+    "x_summary": "Dubai Storm is trending with residents sharing dramatic flooding videos. Mixed reactions between concern for safety and amazement at unusual weather.",
+    "viral_rumors": [
+        "Claims that Burj Khalifa was struck by lightning - UNVERIFIED",
+        "Reports of 'cloud seeding' causing the storm - DEBATED"
+    ],
+    "sources": [
+        {"handle": "@DubaiMediaOffice", "link": "https://x.com/DubaiMediaOffice", "text": "Heavy rainfall expected. Residents advised to stay indoors and avoid unnecessary travel."},
+        {"handle": "@weatheruae", "link": "https://x.com/weatheruae", "text": "Historic rainfall levels recorded in Dubai. Stay safe everyone!"},
+        {"handle": "@gaborsteingart", "link": "https://x.com/gaborsteingart", "text": "Incredible scenes from Dubai airport as floods disrupt flights."}
+    ]
+}
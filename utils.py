@@ -1,13 +1,254 @@
-import json
+import functools
+import hashlib
+import inspect
 import os
-from datetime import datetime
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import closing
 
-HISTORY_FILE = "history.json"
+import orjson
+
+# One JSON object per line, oldest first, so a save is a single append
+HISTORY_FILE = "history.ndjson"
+MAX_HISTORY_ENTRIES = 200
+LEGACY_HISTORY_FILE = "history.json"
+# Seconds a fetched result is reused. The query cache and Dashboard's memory and
+# disk caches share it, so a topic's news, X intel and report refresh together.
+FETCH_TTL = 600
+CACHE_DB = os.path.join(os.path.expanduser("~"), ".counterpoint", "cache.db")
+
+# Environment variables checked for each provider's key, in order
+API_KEY_ENV_VARS = {
+    "tavily": ("Tavily API Key", "TAVILY_API_KEY"),
+    "gemini": ("Gemini API Key", "GEMINI_API_KEY"),
+    "xai": ("XAI_API_KEY",),
+}
+
+def get_api_key(provider):
+    """
+    Returns the API key for a provider, or None if it isn't configured.
+    Looked up in os.environ on every call (a dict lookup, no syscall), so a
+    key added, rotated or revoked from the Settings page takes effect at once.
+    """
+    environ = os.environ
+    return next((environ[name] for name in API_KEY_ENV_VARS[provider] if environ.get(name)), None)
+
+class QueryCache:
+    """
+    In-memory TTL cache for full analysis results, keyed by normalized topic.
+    """
+
+    def __init__(self, max_size=128, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(topic):
+        return hashlib.md5(topic.lower().strip().encode("utf-8")).hexdigest()
+
+    def get(self, topic):
+        """
+        Returns the cached result for a topic, or None if missing or expired.
+        """
+        key = self._key(topic)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            timestamp, result = entry
+            if time.time() - timestamp > self.ttl:
+                del self._entries[key]
+                return None
+            return result
+
+    def set(self, topic, result):
+        """
+        Stores a result for a topic, evicting the oldest entries when full.
+        """
+        with self._lock:
+            self._evict_if_needed()
+            self._entries[self._key(topic)] = (time.time(), result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_if_needed(self):
+        if len(self._entries) < self.max_size:
+            return
+        # Drop the oldest 10% so eviction isn't paid on every insert
+        oldest = sorted(self._entries, key=lambda k: self._entries[k][0])
+        for key in oldest[:max(1, self.max_size // 10)]:
+            del self._entries[key]
+
+# Module-level so cached results survive Streamlit reruns
+query_cache = QueryCache(ttl=FETCH_TTL)
+
+def _connect_cache_db():
+    os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)"
+    )
+    return conn
+
+# The disk cache is best effort: an unwritable directory, a locked database or
+# a corrupt entry counts as a miss (or a skipped store), never as a failed request.
+# pickle.loads on a damaged blob can raise almost anything, hence the broad catch.
+
+def _disk_cache_get(key):
+    try:
+        with closing(_connect_cache_db()) as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+    except Exception:
+        return None
+
+def _disk_cache_set(key, value, ttl):
+    now = time.time()
+    try:
+        with closing(_connect_cache_db()) as conn, conn:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                (key, now + ttl, pickle.dumps(value))
+            )
+    except Exception:
+        pass
+
+def clear_disk_cache():
+    """
+    Removes every entry from the on-disk result cache, if it can be opened.
+    """
+    try:
+        with closing(_connect_cache_db()) as conn, conn:
+            conn.execute("DELETE FROM cache")
+    except (sqlite3.Error, OSError):
+        pass
+
+def disk_cached(ttl=3600, cache_if=bool):
+    """
+    Caches a topic-keyed function's result in SQLite so it survives restarts
+    and is shared between Streamlit workers.
+
+    The key is the function name plus the normalized first argument (the topic).
+    Results failing cache_if, e.g. error payloads, are not stored. Generator
+    functions are cached as their joined text and replayed as a single chunk.
+    """
+    def decorator(func):
+        def cache_key(topic):
+            return hashlib.sha1((func.__name__ + topic.lower().strip()).encode("utf-8")).hexdigest()
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def stream_wrapper(topic, *args, **kwargs):
+                key = cache_key(topic)
+                cached = _disk_cache_get(key)
+                if cached is not None:
+                    yield cached
+                    return
+                chunks = []
+                for chunk in func(topic, *args, **kwargs):
+                    chunks.append(chunk)
+                    yield chunk
+                text = "".join(chunks)
+                if cache_if(text):
+                    _disk_cache_set(key, text, ttl)
+            return stream_wrapper
+
+        @functools.wraps(func)
+        def wrapper(topic, *args, **kwargs):
+            key = cache_key(topic)
+            cached = _disk_cache_get(key)
+            if cached is not None:
+                return cached
+            result = func(topic, *args, **kwargs)
+            if cache_if(result):
+                _disk_cache_set(key, result, ttl)
+            return result
+        return wrapper
+    return decorator
+
+# Parsed history shared by all sessions; read from disk once, then kept in sync on write
+_HISTORY_CACHE = None
+_HISTORY_LOCK = threading.Lock()
+# Lines currently in HISTORY_FILE, which may hold more than the capped cache
+_HISTORY_FILE_LINES = 0
+
+def _dump_entry(entry):
+    # orjson emits compact bytes, so files are opened in binary mode
+    return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+
+def _migrate_legacy_history():
+    # One-time conversion of the old newest-first JSON array
+    try:
+        with open(LEGACY_HISTORY_FILE, 'rb') as f:
+            legacy = orjson.loads(f.read())
+    except Exception:
+        return
+    with open(HISTORY_FILE, 'wb') as f:
+        f.writelines(_dump_entry(entry) for entry in reversed(legacy))
+
+def _read_history_file():
+    """
+    Reads the NDJSON history, newest first. Unparseable lines are skipped.
+    """
+    if not os.path.exists(HISTORY_FILE) and os.path.exists(LEGACY_HISTORY_FILE):
+        _migrate_legacy_history()
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    
+    history = []
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    history.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+    except Exception:
+        return []
+    history.reverse()
+    return history
+
+def _cached_history():
+    # Callers must hold _HISTORY_LOCK
+    global _HISTORY_CACHE, _HISTORY_FILE_LINES
+    if _HISTORY_CACHE is None:
+        _HISTORY_CACHE = _read_history_file()
+        _HISTORY_FILE_LINES = len(_HISTORY_CACHE)
+        del _HISTORY_CACHE[MAX_HISTORY_ENTRIES:]
+    return _HISTORY_CACHE
+
+def _compact_history_file(history):
+    # Callers must hold _HISTORY_LOCK. Rewrites the file with only the capped
+    # entries; done once the file reaches twice the cap so appends stay cheap.
+    global _HISTORY_FILE_LINES
+    tmp_path = HISTORY_FILE + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.writelines(_dump_entry(entry) for entry in reversed(history))
+    os.replace(tmp_path, HISTORY_FILE)
+    _HISTORY_FILE_LINES = len(history)
+
+def _result_signature(entry):
+    return (entry.get("topic"), entry.get("confidence_score"), entry.get("report_html", ""))
 
 def save_search(topic, confidence_score, report_html="", x_intel_data=None):
     """
-    Appends a search result to the history JSON.
+    Appends a search result to the history file, unless it repeats the newest entry.
+    Only the newest MAX_HISTORY_ENTRIES searches are kept.
     """
+    global _HISTORY_FILE_LINES
+    # Deferred: only needed once a search is actually saved
+    from datetime import datetime
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     new_entry = {
@@ -18,34 +259,37 @@ def save_search(topic, confidence_score, report_html="", x_intel_data=None):
         "x_intel_data": x_intel_data
     }
     
-    # Load existing history
-    history = load_history()
-    
-    # Append new entry at the beginning
-    history.insert(0, new_entry)
-    
-    # Save back to file
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
+    with _HISTORY_LOCK:
+        history = _cached_history()
+        
+        # A repeated submit of the same result would only add a duplicate line
+        if history and _result_signature(history[0]) == _result_signature(new_entry):
+            return
+        
+        # Newest first in memory; on disk only the new line is written
+        history.insert(0, new_entry)
+        del history[MAX_HISTORY_ENTRIES:]
+        if _HISTORY_FILE_LINES + 1 >= 2 * MAX_HISTORY_ENTRIES:
+            _compact_history_file(history)
+            return
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(_dump_entry(new_entry))
+        _HISTORY_FILE_LINES += 1
 
 def load_history():
     """
-    Loads the search history from JSON.
+    Loads the search history, parsing the file only on first use.
+    Returns a copy so callers can't mutate the shared cache.
     """
-    if not os.path.exists(HISTORY_FILE):
-        return []
-    
-    try:
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    except Exception:
-        return []
+    with _HISTORY_LOCK:
+        return list(_cached_history())
 
 def get_search_by_index(index):
     """
     Retrieves a specific search entry by its index.
     """
-    history = load_history()
-    if 0 <= index < len(history):
-        return history[index]
+    with _HISTORY_LOCK:
+        history = _cached_history()
+        if 0 <= index < len(history):
+            return history[index]
     return None